@@ -6,20 +6,28 @@ import os.path
 import re
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
 from io import BufferedIOBase
+from operator import attrgetter
 from pathlib import Path
 from threading import current_thread
 from typing import Optional, Match, List, Dict, Pattern, Callable, Union, \
-    TextIO, IO
+    TextIO, IO, Any, Tuple
 from zipfile import ZipFile, ZipInfo, is_zipfile
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from modules import datafile, header
 from modules.classes import GameEntry, Score, RegionData, \
     GameEntryKeyGenerator, FileData, MultiThreadedProgressBar, IndexedThread, \
-    CustomJsonEncoder
+    CustomJsonEncoder, NameData, json_default
 from modules.header import Rule
 from modules.utils import get_index, check_in_pattern_list, to_int_list, \
-    add_padding, get_or_default, available_columns, trim_to, is_valid
+    add_padding, get_or_default, available_columns, trim_to, merge_patterns
 
 __version__ = '1.9.12-SNAPSHOT'
 
@@ -48,6 +56,59 @@ JSON_ENCODER = CustomJsonEncoder()
 
 DEBUG = False
 
+SHORT_OPTIONS = 'hd:r:e:i:Vo:l:w:v'
+
+LONG_OPTIONS = (
+    'help',
+    'dat=',
+    'regions=',
+    'no-bios',
+    'no-program',
+    'no-enhancement-chip',
+    'no-beta',
+    'no-demo',
+    'no-sample',
+    'no-proto',
+    'no-pirate',
+    'no-aftermarket',
+    'no-homebrew',
+    'no-promo',
+    'no-all',
+    'no-unlicensed',
+    'all-regions',
+    'early-revisions',
+    'early-versions',
+    'input-order',
+    'extension=',
+    'no-scan',
+    'input-dir=',
+    'prefer=',
+    'avoid=',
+    'exclude=',
+    'exclude-after=',
+    'separator=',
+    'ignore-case',
+    'regex',
+    'verbose',
+    'output-dir=',
+    'languages=',
+    'prioritize-languages',
+    'language-weight=',
+    'prefer-parents',
+    'prefer-prereleases',
+    'all-regions-with-lang',
+    'debug',
+    'move',
+    'symlink',
+    'relative',
+    'chunk-size=',
+    'threads=',
+    'header-file=',
+    'max-file-size=',
+    'version',
+    'only-selected-lang',
+    'group-by-first-letter')
+
 COUNTRY_REGION_CORRELATION = [
     # Language needs checking
     RegionData('ASI', re.compile(r'(Asia)', re.IGNORECASE), ['zh']),
@@ -82,15 +143,17 @@ COUNTRY_REGION_CORRELATION = [
     RegionData('UNK', re.compile(r'(Unknown)', re.IGNORECASE), ['en'])
 ]
 
+REGION_BY_CODE = {r.code: r for r in COUNTRY_REGION_CORRELATION}
+
 SECTIONS_REGEX = re.compile(r'\(([^()]+)\)')
-BIOS_REGEX = re.compile(re.escape('[BIOS]'), re.IGNORECASE)
+BIOS_TOKEN = '[bios]'
 PROGRAM_REGEX = re.compile(r'\((?:Test\s*)?Program\)', re.IGNORECASE)
 ENHANCEMENT_CHIP_REGEX = re.compile(r'\(Enhancement\s*Chip\)', re.IGNORECASE)
-UNL_REGEX = re.compile(re.escape('(Unl)'), re.IGNORECASE)
-PIRATE_REGEX = re.compile(re.escape('(Pirate)'), re.IGNORECASE)
-AFTERMARKET_REGEX = re.compile(re.escape('(Aftermarket)'), re.IGNORECASE)
-HOMEBREW_REGEX = re.compile(re.escape('(Homebrew)'), re.IGNORECASE)
-PROMO_REGEX = re.compile(re.escape('(Promo)'), re.IGNORECASE)
+UNL_TOKEN = '(unl)'
+PIRATE_TOKEN = '(pirate)'
+AFTERMARKET_TOKEN = '(aftermarket)'
+HOMEBREW_TOKEN = '(homebrew)'
+PROMO_TOKEN = '(promo)'
 BETA_REGEX = re.compile(r'\(Beta(?:\s*([a-z0-9.]+))?\)', re.IGNORECASE)
 PROTO_REGEX = re.compile(r'\(Proto(?:\s*([a-z0-9.]+))?\)', re.IGNORECASE)
 SAMPLE_REGEX = re.compile(r'\(Sample(?:\s*([a-z0-9.]+))?\)', re.IGNORECASE)
@@ -98,9 +161,10 @@ DEMO_REGEX = re.compile(r'\(Demo(?:\s*([a-z0-9.]+))?\)', re.IGNORECASE)
 REV_REGEX = re.compile(r'\(Rev\s*([a-z0-9.]+)\)', re.IGNORECASE)
 VERSION_REGEX = re.compile(r'\(v\s*([a-z0-9.]+)\)', re.IGNORECASE)
 LANGUAGES_REGEX = re.compile(r'\(([a-z]{2}(?:[,+][a-z]{2})*)\)', re.IGNORECASE)
-BAD_REGEX = re.compile(re.escape('[b]'), re.IGNORECASE)
+BAD_TOKEN = '[b]'
 ZIP_REGEX = re.compile(r'\.zip$', re.IGNORECASE)
 ALPHABETICAL_REGEX = re.compile(r'^[a-z]', re.IGNORECASE)
+LIST_ITEM_REGEX = re.compile(r'\s*([^,\s][^,]*?)\s*(?:,|$)')
 
 
 def parse_revision(name: str) -> str:
@@ -115,15 +179,21 @@ def parse_prerelease(match: Optional[Match]) -> str:
     return get_or_default(match, NOT_PRERELEASE)
 
 
+# The same few section elements repeat throughout a DAT. Regions added later
+# have no pattern, so they can never invalidate a cached result.
+@lru_cache(maxsize=None)
+def parse_region_element(element: str) -> Tuple[RegionData, ...]:
+    return tuple([
+        region_data for region_data in COUNTRY_REGION_CORRELATION
+        if region_data.pattern and region_data.pattern.fullmatch(element)])
+
+
 def parse_region_data(name: str) -> List[RegionData]:
     parsed = []
     for section in SECTIONS_REGEX.finditer(name):
         elements = [element.strip() for element in section.group(1).split(',')]
         for element in elements:
-            for region_data in COUNTRY_REGION_CORRELATION:
-                if region_data.pattern \
-                        and region_data.pattern.fullmatch(element):
-                    parsed.append(region_data)
+            parsed.extend(parse_region_element(element))
     return parsed
 
 
@@ -139,16 +209,13 @@ def parse_languages(name: str) -> List[str]:
 
 def get_region_data(code: str) -> Optional[RegionData]:
     code = code.upper() if code else code
-    region_data = None
-    for r in COUNTRY_REGION_CORRELATION:
-        if r.code == code:
-            region_data = r
-            break
+    region_data = REGION_BY_CODE.get(code)
     if not region_data:
         # We don't know which region this is, but we should filter/classify it
         log('WARNING: unrecognized region (%s)' % code)
         region_data = RegionData(code, None, [])
         COUNTRY_REGION_CORRELATION.append(region_data)
+        REGION_BY_CODE[code] = region_data
     return region_data
 
 
@@ -203,6 +270,66 @@ def validate_dat(file: Path, use_hashes: bool) -> None:
             sys.exit()
 
 
+def parse_name(
+        name: str,
+        filter_bios: bool,
+        filter_program: bool,
+        filter_enhancement_chip: bool,
+        filter_pirate: bool,
+        filter_aftermarket: bool,
+        filter_homebrew: bool,
+        filter_promo: bool,
+        filter_unlicensed: bool,
+        filter_proto: bool,
+        filter_beta: bool,
+        filter_demo: bool,
+        filter_sample: bool,
+        exclude: List[Pattern]) -> Optional[NameData]:
+    beta_match = BETA_REGEX.search(name)
+    demo_match = DEMO_REGEX.search(name)
+    sample_match = SAMPLE_REGEX.search(name)
+    proto_match = PROTO_REGEX.search(name)
+    # Literal tags are matched as substrings of the lowercase name
+    lower_name = name.lower()
+    if filter_bios and BIOS_TOKEN in lower_name:
+        return None
+    if filter_unlicensed and UNL_TOKEN in lower_name:
+        return None
+    if filter_pirate and PIRATE_TOKEN in lower_name:
+        return None
+    if filter_aftermarket and AFTERMARKET_TOKEN in lower_name:
+        return None
+    if filter_homebrew and HOMEBREW_TOKEN in lower_name:
+        return None
+    if filter_promo and PROMO_TOKEN in lower_name:
+        return None
+    if filter_program and PROGRAM_REGEX.search(name):
+        return None
+    if filter_enhancement_chip and ENHANCEMENT_CHIP_REGEX.search(name):
+        return None
+    if filter_beta and beta_match:
+        return None
+    if filter_demo and demo_match:
+        return None
+    if filter_sample and sample_match:
+        return None
+    if filter_proto and proto_match:
+        return None
+    if check_in_pattern_list(name, exclude):
+        return None
+    return NameData(
+        BAD_TOKEN in lower_name,
+        bool(beta_match or demo_match or sample_match or proto_match),
+        parse_revision(name),
+        parse_version(name),
+        parse_prerelease(sample_match),
+        parse_prerelease(demo_match),
+        parse_prerelease(beta_match),
+        parse_prerelease(proto_match),
+        [rd.code for rd in parse_region_data(name)],
+        parse_languages(name))
+
+
 def parse_games(
         file: Path,
         filter_bios: bool,
@@ -222,54 +349,30 @@ def parse_games(
     root = datafile.parse(file, silence=True)
     for input_index in range(0, len(root.game)):
         game = root.game[input_index]
-        beta_match = BETA_REGEX.search(game.name)
-        demo_match = DEMO_REGEX.search(game.name)
-        sample_match = SAMPLE_REGEX.search(game.name)
-        proto_match = PROTO_REGEX.search(game.name)
-        if filter_bios and BIOS_REGEX.search(game.name):
-            continue
-        if filter_unlicensed and UNL_REGEX.search(game.name):
-            continue
-        if filter_pirate and PIRATE_REGEX.search(game.name):
-            continue
-        if filter_aftermarket and AFTERMARKET_REGEX.search(game.name):
-            continue
-        if filter_homebrew and HOMEBREW_REGEX.search(game.name):
-            continue
-        if filter_promo and PROMO_REGEX.search(game.name):
-            continue
-        if filter_program and PROGRAM_REGEX.search(game.name):
-            continue
-        if filter_enhancement_chip and ENHANCEMENT_CHIP_REGEX.search(game.name):
-            continue
-        if filter_beta and beta_match:
-            continue
-        if filter_demo and demo_match:
-            continue
-        if filter_sample and sample_match:
-            continue
-        if filter_proto and proto_match:
-            continue
-        if check_in_pattern_list(game.name, exclude):
+        name_data = parse_name(
+            game.name,
+            filter_bios,
+            filter_program,
+            filter_enhancement_chip,
+            filter_pirate,
+            filter_aftermarket,
+            filter_homebrew,
+            filter_promo,
+            filter_unlicensed,
+            filter_proto,
+            filter_beta,
+            filter_demo,
+            filter_sample,
+            exclude)
+        if not name_data:
             continue
         is_parent = not game.cloneof
-        is_bad = bool(BAD_REGEX.search(game.name))
-        beta = parse_prerelease(beta_match)
-        demo = parse_prerelease(demo_match)
-        sample = parse_prerelease(sample_match)
-        proto = parse_prerelease(proto_match)
-        is_prerelease = bool(
-            beta_match
-            or demo_match
-            or sample_match
-            or proto_match)
-        revision = parse_revision(game.name)
-        version = parse_version(game.name)
-        region_data = parse_region_data(game.name)
+        region_data = [
+            get_region_data(code) for code in name_data.region_codes]
         for release in game.release:
             if release.region and not is_present(release.region, region_data):
                 region_data.append(get_region_data(release.region))
-        languages = parse_languages(game.name)
+        languages = name_data.languages
         if not languages:
             languages = get_languages(region_data)
         parent_name = game.cloneof if game.cloneof else game.name
@@ -278,17 +381,17 @@ def parse_games(
         for region in region_codes:
             game_entries.append(
                 GameEntry(
-                    is_bad,
-                    is_prerelease,
+                    name_data.is_bad,
+                    name_data.is_prerelease,
                     region,
                     languages,
                     input_index,
-                    revision,
-                    version,
-                    sample,
-                    demo,
-                    beta,
-                    proto,
+                    name_data.revision,
+                    name_data.version,
+                    name_data.sample,
+                    name_data.demo,
+                    name_data.beta,
+                    name_data.proto,
                     is_parent,
                     game.name,
                     game.rom if game.rom else []))
@@ -304,13 +407,11 @@ def parse_games(
     return games
 
 
-def pad_values(
-        games: List[GameEntry],
-        get_function: Callable[[GameEntry], str],
-        set_function: Callable[[GameEntry, str], None]) -> None:
+def pad_values(games: List[GameEntry], attribute: str) -> None:
+    get_function = attrgetter(attribute)
     padded = add_padding([get_function(g) for g in games])
     for i in range(0, len(padded)):
-        set_function(games[i], padded[i])
+        setattr(games[i], attribute, padded[i])
 
 
 def language_value(
@@ -337,6 +438,8 @@ def index_files(
             also_check_archive |= bool(ZIP_REGEX.search(rom_entry.name))
     print('Scanning directory: %s\033[K' % input_dir, file=sys.stderr)
     files_data = []
+    # Queried once, instead of once per file found
+    found_columns = available_columns(FOUND_PREFIX) - 2
     for full_path in input_dir.rglob('*'):
         if not full_path.is_file():
             continue
@@ -346,7 +449,7 @@ def index_files(
                     FOUND_PREFIX,
                     trim_to(
                         full_path.relative_to(input_dir),
-                        available_columns(FOUND_PREFIX) - 2)),
+                        found_columns)),
                 end='\r',
                 file=sys.stderr)
             file_size = full_path.stat().st_size
@@ -355,7 +458,7 @@ def index_files(
             print(
                 'Error while reading file: %s\033[K' % e,
                 file=sys.stderr)
-    files_data.sort(key=FileData.get_size, reverse=True)
+    files_data.sort(key=attrgetter('size'), reverse=True)
     print('%s%i files\033[K' % (FOUND_PREFIX, len(files_data)), file=sys.stderr)
 
     if files_data:
@@ -400,12 +503,13 @@ def index_files(
         for t in threads:
             t.join()
 
+        PROGRESSBAR.finish()
         print('\n', file=sys.stderr)
 
         for intermediate_result in intermediate_results:
             for key, value in intermediate_result.items():
                 if key in result and not \
-                        (result[key] and is_zipfile(result[key])):
+                        (result[key] and is_archive(result[key])):
                     result[key] = value
     return result
 
@@ -424,13 +528,19 @@ def get_header_rules(root: datafile) -> List[Rule]:
                 return []
 
 
+@lru_cache(maxsize=None)
+def is_archive(path: Path) -> bool:
+    return is_zipfile(path)
+
+
 # noinspection PyBroadException
 def process_file(
         file_data: FileData,
         also_check_archive: bool) -> Dict[str, Path]:
     full_path = file_data.path
     result: Dict[str, Path] = {}
-    is_zip = is_zipfile(full_path)
+    debug = DEBUG
+    is_zip = is_archive(full_path)
     if is_zip:
         try:
             with ZipFile(full_path) as compressed_file:
@@ -442,7 +552,7 @@ def process_file(
                     with compressed_file.open(file_info) as internal_file:
                         digest = compute_hash(file_size, internal_file)
                         result[digest] = full_path
-                        if DEBUG:
+                        if debug:
                             log("DEBUG: Scan result for file [%s]: %s"
                                 % (
                                     "%s:%s" % (full_path, file_info.filename),
@@ -456,11 +566,11 @@ def process_file(
             file_size: int = full_path.stat().st_size
             with full_path.open('rb') as uncompressed_file:
                 digest = compute_hash(file_size, uncompressed_file)
-                if DEBUG:
+                if debug:
                     log("DEBUG: Scan result for file [%s]: %s"
                         % (full_path, digest))
                 if digest not in result or \
-                        (result[digest] and is_zipfile(result[digest])):
+                        (result[digest] and is_archive(result[digest])):
                     result[digest] = full_path
         except Exception as e:
             print(
@@ -473,98 +583,41 @@ def compute_hash(
         file_size: int,
         internal_file: Union[BufferedIOBase, IO[bytes]]) -> str:
     hasher = hashlib.sha1()
-    if RULES and file_size <= MAX_FILE_SIZE:
+    rules = RULES
+    if rules and file_size <= MAX_FILE_SIZE:
         file_bytes = internal_file.read()
-        for rule in RULES:
+        for rule in rules:
             if rule.test(file_bytes):
                 file_bytes = rule.apply(file_bytes)
         hasher.update(file_bytes)
     else:
+        # Looked up once, as the loop runs once per chunk
+        read = internal_file.read
+        update = hasher.update
+        chunk_size = CHUNK_SIZE
         while True:
-            chunk = internal_file.read(CHUNK_SIZE)
+            chunk = read(chunk_size)
             if not chunk:
                 break
-            hasher.update(chunk)
+            update(chunk)
     return hasher.hexdigest().lower()
 
 
+def parse_positive_int(name: str, arg: str) -> int:
+    value = arg.strip()
+    # Rejects signs, separators and blanks before int() sees them
+    if not value.isdecimal() or not int(value):
+        sys.exit(help_msg('%s must be a positive integer' % name))
+    return int(value)
+
+
 def main(argv: List[str]):
     try:
-        opts, args = getopt.getopt(argv, 'hd:r:e:i:Vo:l:w:v', [
-            'help',
-            'dat=',
-            'regions=',
-            'no-bios',
-            'no-program',
-            'no-enhancement-chip',
-            'no-beta',
-            'no-demo',
-            'no-sample',
-            'no-proto',
-            'no-pirate',
-            'no-aftermarket',
-            'no-homebrew',
-            'no-promo',
-            'no-all',
-            'no-unlicensed',
-            'all-regions',
-            'early-revisions',
-            'early-versions',
-            'input-order',
-            'extension=',
-            'no-scan',
-            'input-dir=',
-            'prefer=',
-            'avoid=',
-            'exclude=',
-            'exclude-after=',
-            'separator=',
-            'ignore-case',
-            'regex',
-            'verbose',
-            'output-dir=',
-            'languages=',
-            'prioritize-languages',
-            'language-weight=',
-            'prefer-parents',
-            'prefer-prereleases',
-            'all-regions-with-lang',
-            'debug',
-            'move',
-            'symlink',
-            'relative',
-            'chunk-size=',
-            'threads=',
-            'header-file=',
-            'max-file-size=',
-            'version',
-            'only-selected-lang',
-            'group-by-first-letter'
-        ])
+        opts, args = getopt.getopt(argv, SHORT_OPTIONS, LONG_OPTIONS)
     except getopt.GetoptError as e:
         sys.exit(help_msg(e))
 
     dat_file: Optional[Path] = None
-    filter_bios = False
-    filter_program = False
-    filter_enhancement_chip = False
-    filter_unlicensed = False
-    filter_pirate = False
-    filter_aftermarket = False
-    filter_homebrew = False
-    filter_promo = False
-    filter_proto = False
-    filter_beta = False
-    filter_demo = False
-    filter_sample = False
-    all_regions = False
-    all_regions_with_lang = False
-    only_selected_lang = False
-    revision_asc = False
-    version_asc = False
-    verbose = False
-    no_scan = False
-    input_order = False
     selected_regions: List[str] = []
     file_extension = ""
     input_dir: Optional[Path] = None
@@ -573,113 +626,99 @@ def main(argv: List[str]):
     avoid_str = ""
     exclude_after_str = ""
     sep = ','
-    ignore_case = False
-    regex = False
     output_dir: Optional[Path] = None
     selected_languages: List[str] = []
-    prioritize_languages = False
-    prefer_parents = False
-    prefer_prereleases = False
-    group_by_first_letter = False
     language_weight = 3
-    move = False
-    symlink = False
-    relative = False
     global THREADS
     global RULES
     global MAX_FILE_SIZE
     global CHUNK_SIZE
     global DEBUG
     for opt, arg in opts:
-        if opt in ('-h', '--help'):
-            print(help_msg())
-            sys.exit()
-        if opt in ('-v', '--version'):
-            print('1G1R ROM set generator v%s' % __version__)
-            sys.exit()
-        if opt in ('-r', '--regions'):
-            selected_regions = [x.strip().upper() for x in arg.split(',')
-                                if is_valid(x)]
-        if opt in ('-l', '--languages'):
-            selected_languages = [x.strip().lower()
-                                  for x in reversed(arg.split(','))
-                                  if is_valid(x)]
-        if opt in ('-w', '--language-weight'):
-            try:
-                language_weight = int(arg.strip())
-                if language_weight <= 0:
-                    sys.exit(help_msg(
-                        'language-weight must be a positive integer'))
-            except ValueError:
-                sys.exit(help_msg('invalid value for language-weight'))
-        prioritize_languages |= opt == '--prioritize-languages'
-        filter_bios |= opt in ('--no-bios', '--no-all')
-        filter_program |= opt in ('--no-program', '--no-all')
-        filter_enhancement_chip |= opt in ('--no-enhancement-chip', '--no-all')
-        filter_proto |= opt in ('--no-proto', '--no-all')
-        filter_beta |= opt in ('--no-beta', '--no-all')
-        filter_demo |= opt in ('--no-demo', '--no-all')
-        filter_sample |= opt in ('--no-sample', '--no-all')
-        filter_pirate |= opt in ('--no-pirate', '--no-all')
-        filter_aftermarket |= opt in ('--no-aftermarket', '--no-all')
-        filter_homebrew |= opt in ('--no-homebrew', '--no-all')
-        filter_promo |= opt in ('--no-promo', '--no-all')
-        filter_unlicensed |= opt == '--no-unlicensed'
-        all_regions |= opt == '--all-regions'
-        all_regions_with_lang |= opt == '--all-regions-with-lang'
-        only_selected_lang |= opt == '--only-selected-lang'
-        revision_asc |= opt == '--early-revisions'
-        version_asc |= opt == '--early-versions'
-        DEBUG |= opt == '--debug'
-        verbose |= DEBUG or opt in ('-V', '--verbose')
-        ignore_case |= opt == '--ignore-case'
-        regex |= opt == '--regex'
-        if opt == '--separator':
-            sep = arg.strip()
-        input_order |= opt == '--input-order'
-        prefer_parents |= opt == '--prefer-parents'
-        prefer_prereleases |= opt == '--prefer-prereleases'
         if opt in ('-d', '--dat'):
             dat_file = Path(arg.strip()).expanduser()
             if not dat_file.is_file():
                 sys.exit(help_msg('invalid DAT file: %s' % dat_file))
-        if opt in ('-e', '--extension'):
-            file_extension = arg.strip().lstrip('.')
-        no_scan |= opt == '--no-scan'
-        if opt == '--prefer':
-            prefer_str = arg
-        if opt == '--avoid':
-            avoid_str = arg
-        if opt == '--exclude':
-            exclude_str = arg
-        if opt == '--exclude-after':
-            exclude_after_str = arg
-        if opt in ('-i', '--input-dir'):
+        elif opt in ('-r', '--regions'):
+            selected_regions = LIST_ITEM_REGEX.findall(arg.upper())
+        elif opt in ('-i', '--input-dir'):
             input_dir = Path(arg.strip()).expanduser()
             if not input_dir.is_dir():
                 sys.exit(help_msg('invalid input directory: %s' % input_dir))
-        if opt in ('-o', '--output-dir'):
+        elif opt in ('-o', '--output-dir'):
             output_dir = Path(arg.strip()).expanduser()
             if not output_dir.is_dir():
                 try:
                     output_dir.mkdir(parents=True, exist_ok=True)
                 except OSError:
                     sys.exit(help_msg('invalid output DIR: %s' % output_dir))
-        move |= opt == '--move'
-        symlink |= opt == '--symlink'
-        relative |= opt == '--relative'
-        if opt == '--chunk-size':
-            CHUNK_SIZE = int(arg)
-        if opt == '--threads':
-            THREADS = int(arg)
-        if opt == '--header-file':
+        elif opt in ('-l', '--languages'):
+            selected_languages = LIST_ITEM_REGEX.findall(arg.lower())
+            selected_languages.reverse()
+        elif opt in ('-w', '--language-weight'):
+            language_weight = parse_positive_int('language-weight', arg)
+        elif opt in ('-e', '--extension'):
+            file_extension = arg.strip().lstrip('.')
+        elif opt == '--prefer':
+            prefer_str = arg
+        elif opt == '--avoid':
+            avoid_str = arg
+        elif opt == '--exclude':
+            exclude_str = arg
+        elif opt == '--exclude-after':
+            exclude_after_str = arg
+        elif opt == '--separator':
+            sep = arg.strip()
+        elif opt == '--threads':
+            THREADS = parse_positive_int('threads', arg)
+        elif opt == '--chunk-size':
+            CHUNK_SIZE = parse_positive_int('chunk-size', arg)
+        elif opt == '--max-file-size':
+            MAX_FILE_SIZE = parse_positive_int('max-file-size', arg)
+        elif opt == '--header-file':
             header_file = Path(arg.strip()).expanduser()
             if not header_file.is_file():
                 sys.exit(help_msg('invalid header file: %s' % header_file))
             RULES = header.parse_rules(header_file)
-        if opt == '--max-file-size':
-            MAX_FILE_SIZE = int(arg)
-        group_by_first_letter |= opt == '--group-by-first-letter'
+        elif opt in ('-h', '--help'):
+            print(help_msg())
+            sys.exit()
+        elif opt in ('-v', '--version'):
+            print('1G1R ROM set generator v%s' % __version__)
+            sys.exit()
+
+    present = {opt for opt, _ in opts}
+    no_all = '--no-all' in present
+    prioritize_languages = '--prioritize-languages' in present
+    filter_bios = no_all or '--no-bios' in present
+    filter_program = no_all or '--no-program' in present
+    filter_enhancement_chip = no_all or '--no-enhancement-chip' in present
+    filter_proto = no_all or '--no-proto' in present
+    filter_beta = no_all or '--no-beta' in present
+    filter_demo = no_all or '--no-demo' in present
+    filter_sample = no_all or '--no-sample' in present
+    filter_pirate = no_all or '--no-pirate' in present
+    filter_aftermarket = no_all or '--no-aftermarket' in present
+    filter_homebrew = no_all or '--no-homebrew' in present
+    filter_promo = no_all or '--no-promo' in present
+    filter_unlicensed = '--no-unlicensed' in present
+    all_regions = '--all-regions' in present
+    all_regions_with_lang = '--all-regions-with-lang' in present
+    only_selected_lang = '--only-selected-lang' in present
+    revision_asc = '--early-revisions' in present
+    version_asc = '--early-versions' in present
+    DEBUG = '--debug' in present
+    verbose = DEBUG or '-V' in present or '--verbose' in present
+    ignore_case = '--ignore-case' in present
+    regex = '--regex' in present
+    input_order = '--input-order' in present
+    prefer_parents = '--prefer-parents' in present
+    prefer_prereleases = '--prefer-prereleases' in present
+    no_scan = '--no-scan' in present
+    move = '--move' in present
+    symlink = '--symlink' in present
+    relative = '--relative' in present
+    group_by_first_letter = '--group-by-first-letter' in present
 
     if not no_scan and not input_dir:
         print(
@@ -721,26 +760,29 @@ def main(argv: List[str]):
             'all-regions is mutually exclusive with all-regions-with-lang'))
     if group_by_first_letter and not output_dir:
         sys.exit(help_msg('group-by-first-letter requires an output directory'))
-    if THREADS <= 0:
-        sys.exit(help_msg('Number of threads should be > 0'))
-    if MAX_FILE_SIZE <= 0:
-        sys.exit(help_msg('Maximum file size should be > 0'))
-    try:
-        prefer = parse_list(prefer_str, ignore_case, regex, sep)
-    except (re.error, OSError) as e:
-        sys.exit(help_msg('invalid prefer list: %s' % e))
-    try:
-        avoid = parse_list(avoid_str, ignore_case, regex, sep)
-    except (re.error, OSError) as e:
-        sys.exit(help_msg('invalid avoid list: %s' % e))
-    try:
-        exclude = parse_list(exclude_str, ignore_case, regex, sep)
-    except (re.error, OSError) as e:
-        sys.exit(help_msg('invalid exclude list: %s' % e))
-    try:
-        exclude_after = parse_list(exclude_after_str, ignore_case, regex, sep)
-    except (re.error, OSError) as e:
-        sys.exit(help_msg('invalid exclude-after list: %s' % e))
+    list_strs = (prefer_str, avoid_str, exclude_str, exclude_after_str)
+    parse_function = partial(
+        parse_list,
+        ignore_case=ignore_case,
+        regex=regex,
+        separator=sep)
+    num_list_files = len([x for x in list_strs if x.startswith(FILE_PREFIX)])
+    if num_list_files > 1:
+        # Reading files mostly waits on I/O, so they can be read concurrently
+        with ThreadPoolExecutor(num_list_files) as executor:
+            list_getters = [
+                executor.submit(parse_function, x).result for x in list_strs]
+    else:
+        list_getters = [partial(parse_function, x) for x in list_strs]
+    patterns: List[List[Pattern]] = []
+    for list_name, list_getter in zip(
+            ('prefer', 'avoid', 'exclude', 'exclude-after'),
+            list_getters):
+        try:
+            patterns.append(list_getter())
+        except (re.error, OSError) as e:
+            sys.exit(help_msg('invalid %s list: %s' % (list_name, e)))
+    prefer, avoid, exclude, exclude_after = patterns
 
     validate_dat(dat_file, use_hashes)
 
@@ -748,7 +790,7 @@ def main(argv: List[str]):
     if use_hashes and input_dir:
         hash_index = index_files(input_dir, dat_file)
         if DEBUG:
-            log('DEBUG: Scanned files: %s' % JSON_ENCODER.encode(hash_index))
+            log('DEBUG: Scanned files: %s' % to_json(hash_index))
 
     parsed_games = parse_games(
         dat_file,
@@ -834,30 +876,15 @@ def main(argv: List[str]):
         avoid)
     for key in parsed_games:
         games = parsed_games[key]
-        pad_values(
-            games,
-            GameEntry.get_version,
-            GameEntry.set_version)
-        pad_values(
-            games,
-            GameEntry.get_revision,
-            GameEntry.set_revision)
-        pad_values(
-            games,
-            GameEntry.get_sample,
-            GameEntry.set_sample)
-        pad_values(
-            games,
-            GameEntry.get_demo,
-            GameEntry.set_demo)
-        pad_values(
-            games,
-            GameEntry.get_beta,
-            GameEntry.set_beta)
-        pad_values(
-            games,
-            GameEntry.get_proto,
-            GameEntry.set_proto)
+        # Most games have a single candidate, which needs no padding or sort
+        multiple = len(games) > 1
+        if multiple:
+            pad_values(games, 'version')
+            pad_values(games, 'revision')
+            pad_values(games, 'sample')
+            pad_values(games, 'demo')
+            pad_values(games, 'beta')
+            pad_values(games, 'proto')
         set_scores(
             games,
             selected_regions,
@@ -865,7 +892,8 @@ def main(argv: List[str]):
             language_weight,
             revision_asc,
             version_asc)
-        games.sort(key=key_generator.generate)
+        if multiple:
+            key_generator.sort(games)
         if verbose:
             log(
                 'INFO: Candidate order for [%s]: %s'
@@ -887,13 +915,13 @@ def main(argv: List[str]):
         if DEBUG:
             log(
                 'DEBUG: Candidates for game [%s] before filtering: %s'
-                % (game, JSON_ENCODER.encode(entries)))
+                % (game, to_json(entries)))
         if not all_regions:
             entries = [x for x in entries if include_candidate(x)]
         if DEBUG:
             log(
                 'DEBUG: Candidates for game [%s] after filtering: %s'
-                % (game, JSON_ENCODER.encode(entries)))
+                % (game, to_json(entries)))
         size = len(entries)
         curr_out_dir = output_dir
         for i in range(0, size):
@@ -912,7 +940,7 @@ def main(argv: List[str]):
                     digest = entry_rom.sha1.lower()
                     rom_input_path = hash_index[digest]
                     if rom_input_path:
-                        is_zip = is_zipfile(rom_input_path)
+                        is_zip = is_archive(rom_input_path)
                         file = rom_input_path.relative_to(input_dir)
                         if not curr_out_dir:
                             if rom_input_path not in copied_files:
@@ -1023,16 +1051,17 @@ def parse_list(
             file = Path((arg_str[len(FILE_PREFIX):]).strip()).expanduser()
             if not file.is_file():
                 raise OSError('invalid file: %s' % file)
-            arg_list = [x.strip() for x in open(file) if is_valid(x)]
+            entries = file.read_text().splitlines()
         else:
-            arg_list = [x.strip() for x in arg_str.split(separator)
-                        if is_valid(x)]
-        if ignore_case:
-            return [re.compile(x if regex else re.escape(x), re.IGNORECASE)
-                    for x in arg_list if is_valid(x)]
-        else:
-            return [re.compile(x if regex else re.escape(x))
-                    for x in arg_list if is_valid(x)]
+            entries = arg_str.split(separator)
+        # Repeated entries would only be compiled and matched again
+        arg_list = list(dict.fromkeys(
+            [x for x in [y.strip() for y in entries] if x]))
+        flags = re.IGNORECASE if ignore_case else 0
+        # A single alternation is matched in one pass instead of one per entry
+        return merge_patterns([
+            re.compile(x if regex else re.escape(x), flags)
+            for x in arg_list])
     return []
 
 
@@ -1092,234 +1121,247 @@ def transfer_file(
             file=sys.stderr)
 
 
+def to_json(o: Any) -> str:
+    if orjson:
+        return orjson.dumps(o, default=json_default).decode()
+    return JSON_ENCODER.encode(o)
+
+
 def log(s: str) -> None:
     print(s, file=LOG_FILE if LOG_FILE else sys.stderr)
 
 
-def help_msg(s: Optional[Union[str, Exception]] = None) -> str:
-    help_str = '\n'.join([
-        'Usage: python3 %s [options] -d input_file.dat' % sys.argv[0],
+HELP_LINES = (
+    'Options:',
 
-        'Options:',
+    '\n# ROM selection and file manipulation:',
 
-        '\n# ROM selection and file manipulation:',
+    '\t-r,--regions=REGIONS\t'
+    'A list of regions separated by commas'
+    '\n\t\t\t\t'
+    'Ex.: -r USA,EUR,JPN',
 
-        '\t-r,--regions=REGIONS\t'
-        'A list of regions separated by commas'
-        '\n\t\t\t\t'
-        'Ex.: -r USA,EUR,JPN',
+    '\t-l,--languages=LANGS\t'
+    'An optional list of languages separated by commas'
+    '\n\t\t\t\t'
+    'This is a secondary prioritization criteria, not a filter'
+    '\n\t\t\t\t'
+    'Ex.: -l en,es,ru',
 
-        '\t-l,--languages=LANGS\t'
-        'An optional list of languages separated by commas'
-        '\n\t\t\t\t'
-        'This is a secondary prioritization criteria, not a filter'
-        '\n\t\t\t\t'
-        'Ex.: -l en,es,ru',
+    '\t-d,--dat=DAT_FILE\t'
+    'The DAT file to be used'
+    '\n\t\t\t\t'
+    'Ex.: -d snes.dat',
 
-        '\t-d,--dat=DAT_FILE\t'
-        'The DAT file to be used'
-        '\n\t\t\t\t'
-        'Ex.: -d snes.dat',
+    '\t-i,--input-dir=PATH\t'
+    'Provides an input directory (i.e.: where your ROMs are)'
+    '\n\t\t\t\t'
+    'Ex.: -i "C:\\Users\\John\\Downloads\\Emulators\\SNES\\ROMs"',
 
-        '\t-i,--input-dir=PATH\t'
-        'Provides an input directory (i.e.: where your ROMs are)'
-        '\n\t\t\t\t'
-        'Ex.: -i "C:\\Users\\John\\Downloads\\Emulators\\SNES\\ROMs"',
+    '\t-o,--output-dir=PATH\t'
+    'If provided, ROMs will be copied to an output directory'
+    '\n\t\t\t\t'
+    'Ex.: -o "C:\\Users\\John\\Downloads\\Emulators\\SNES\\ROMs\\1G1R"',
 
-        '\t-o,--output-dir=PATH\t'
-        'If provided, ROMs will be copied to an output directory'
-        '\n\t\t\t\t'
-        'Ex.: -o "C:\\Users\\John\\Downloads\\Emulators\\SNES\\ROMs\\1G1R"',
+    '\t--move\t\t\t'
+    'If set, ROMs will be moved, instead of copied, '
+    'to the output directory',
 
-        '\t--move\t\t\t'
-        'If set, ROMs will be moved, instead of copied, '
-        'to the output directory',
+    '\t--symlink\t\t'
+    'If set, ROMs will be symlinked (soft linked) '
+    'to the output directory'
+    '\n\t\t\t\t'
+    'Please note newer versions of Windows 10 require '
+    'elevated privileges to create symlinks',
 
-        '\t--symlink\t\t'
-        'If set, ROMs will be symlinked (soft linked) '
-        'to the output directory'
-        '\n\t\t\t\t'
-        'Please note newer versions of Windows 10 require '
-        'elevated privileges to create symlinks',
+    '\t--relative\t\t'
+    'If set along with --symlink, will create '
+    'relative symlinks instead of absolute',
 
-        '\t--relative\t\t'
-        'If set along with --symlink, will create '
-        'relative symlinks instead of absolute',
+    '\t--group-by-first-letter\t'
+    'If set, groups ROMs on the output directory in subfolders according '
+    'to the first letter in their name',
 
-        '\t--group-by-first-letter\t'
-        'If set, groups ROMs on the output directory in subfolders according '
-        'to the first letter in their name',
+    '\n# File scanning:',
 
-        '\n# File scanning:',
+    '\t--header-file=PATH\t'
+    'Sets the header file to be used when scanning headered ROMs'
+    '\n\t\t\t\t'
+    'You can also just add the file to the headers directory',
 
-        '\t--header-file=PATH\t'
-        'Sets the header file to be used when scanning headered ROMs'
-        '\n\t\t\t\t'
-        'You can also just add the file to the headers directory',
+    '\t--threads=THREADS\t'
+    'Sets the number of I/O threads to be used to read files'
+    '\n\t\t\t\t'
+    'Default: 4',
 
-        '\t--threads=THREADS\t'
-        'Sets the number of I/O threads to be used to read files'
-        '\n\t\t\t\t'
-        'Default: 4',
+    '\t--chunk-size=BYTES\t'
+    'Sets the chunk size for buffered I/O operations (bytes)'
+    '\n\t\t\t\t'
+    'Default: 33554432 (32 MiB)',
 
-        '\t--chunk-size=BYTES\t'
-        'Sets the chunk size for buffered I/O operations (bytes)'
-        '\n\t\t\t\t'
-        'Default: 33554432 (32 MiB)',
+    '\t--max-file-size=BYTES\t'
+    'Sets the maximum file size for header information processing (bytes)'
+    '\n\t\t\t\t'
+    'Default: 268435456 (256 MiB)',
 
-        '\t--max-file-size=BYTES\t'
-        'Sets the maximum file size for header information processing (bytes)'
-        '\n\t\t\t\t'
-        'Default: 268435456 (256 MiB)',
+    '\t--no-scan\t\t'
+    'If set, ROMs are not scanned and only file names are used to identify '
+    'candidates',
 
-        '\t--no-scan\t\t'
-        'If set, ROMs are not scanned and only file names are used to identify '
-        'candidates',
+    '\t-e,--extension=EXT\t'
+    'When not scanning, ROM file names will use this extension'
+    '\n\t\t\t\t'
+    'Ex.: -e zip',
 
-        '\t-e,--extension=EXT\t'
-        'When not scanning, ROM file names will use this extension'
-        '\n\t\t\t\t'
-        'Ex.: -e zip',
+    '\n# Filtering:',
 
-        '\n# Filtering:',
+    '\t--no-bios\t\t'
+    'Filter out BIOSes',
 
-        '\t--no-bios\t\t'
-        'Filter out BIOSes',
+    '\t--no-program\t\t'
+    'Filter out Programs and Test Programs',
 
-        '\t--no-program\t\t'
-        'Filter out Programs and Test Programs',
+    '\t--no-enhancement-chip\t'
+    'Filter out Ehancement Chips',
 
-        '\t--no-enhancement-chip\t'
-        'Filter out Ehancement Chips',
+    '\t--no-proto\t\t'
+    'Filter out prototype ROMs',
 
-        '\t--no-proto\t\t'
-        'Filter out prototype ROMs',
+    '\t--no-beta\t\t'
+    'Filter out beta ROMs',
 
-        '\t--no-beta\t\t'
-        'Filter out beta ROMs',
+    '\t--no-demo\t\t'
+    'Filter out demo ROMs',
 
-        '\t--no-demo\t\t'
-        'Filter out demo ROMs',
+    '\t--no-sample\t\t'
+    'Filter out sample ROMs',
 
-        '\t--no-sample\t\t'
-        'Filter out sample ROMs',
+    '\t--no-pirate\t\t'
+    'Filter out pirate ROMs',
 
-        '\t--no-pirate\t\t'
-        'Filter out pirate ROMs',
+    '\t--no-aftermarket\t\t'
+    'Filter out aftermarket ROMs',
 
-        '\t--no-aftermarket\t\t'
-        'Filter out aftermarket ROMs',
+    '\t--no-homebrew\t\t'
+    'Filter out homebrew ROMs',
 
-        '\t--no-homebrew\t\t'
-        'Filter out homebrew ROMs',
+    '\t--no-promo\t\t'
+    'Filter out promotion ROMs',
 
-        '\t--no-promo\t\t'
-        'Filter out promotion ROMs',
+    '\t--no-all\t\t'
+    'Apply all filters above (WILL STILL ALLOW UNLICENSED ROMs)',
 
-        '\t--no-all\t\t'
-        'Apply all filters above (WILL STILL ALLOW UNLICENSED ROMs)',
+    '\t--no-unlicensed\t\t'
+    'Filter out unlicensed ROMs',
 
-        '\t--no-unlicensed\t\t'
-        'Filter out unlicensed ROMs',
+    '\t--all-regions\t\t'
+    'Includes files of unselected regions, if a selected one is not '
+    'available',
 
-        '\t--all-regions\t\t'
-        'Includes files of unselected regions, if a selected one is not '
-        'available',
+    '\t--all-regions-with-lang\t'
+    'Same as --all-regions, but only if a ROM has at least one selected '
+    'language',
 
-        '\t--all-regions-with-lang\t'
-        'Same as --all-regions, but only if a ROM has at least one selected '
-        'language',
+    '\t--only-selected-lang\t'
+    'Filter out ROMs without any selected languages',
 
-        '\t--only-selected-lang\t'
-        'Filter out ROMs without any selected languages',
+    '\n# Adjustment and customization:',
 
-        '\n# Adjustment and customization:',
+    '\t-w,--language-weight=N\t'
+    'The degree of priority the first selected languages receive over the '
+    'latter ones'
+    '\n\t\t\t\t'
+    'Default: 3',
 
-        '\t-w,--language-weight=N\t'
-        'The degree of priority the first selected languages receive over the '
-        'latter ones'
-        '\n\t\t\t\t'
-        'Default: 3',
+    '\t--prioritize-languages\t'
+    'If set, ROMs matching more languages will be prioritized over ROMs '
+    'matching regions',
 
-        '\t--prioritize-languages\t'
-        'If set, ROMs matching more languages will be prioritized over ROMs '
-        'matching regions',
+    '\t--early-revisions\t'
+    'ROMs of earlier revisions will be prioritized',
 
-        '\t--early-revisions\t'
-        'ROMs of earlier revisions will be prioritized',
+    '\t--early-versions\t'
+    'ROMs of earlier versions will be prioritized',
 
-        '\t--early-versions\t'
-        'ROMs of earlier versions will be prioritized',
+    '\t--input-order\t\t'
+    'ROMs will be prioritized by the order they '
+    'appear in the DAT file',
 
-        '\t--input-order\t\t'
-        'ROMs will be prioritized by the order they '
-        'appear in the DAT file',
+    '\t--prefer-parents\t'
+    'Parent ROMs will be prioritized over clones',
 
-        '\t--prefer-parents\t'
-        'Parent ROMs will be prioritized over clones',
+    '\t--prefer-prereleases\t'
+    'Prerelease (Beta, Proto, etc.) ROMs will be prioritized',
 
-        '\t--prefer-prereleases\t'
-        'Prerelease (Beta, Proto, etc.) ROMs will be prioritized',
+    '\t--prefer=WORDS\t\t'
+    'ROMs containing these words will be preferred'
+    '\n\t\t\t\t'
+    'Ex.: --prefer "Virtual Console,GameCube"'
+    '\n\t\t\t\t'
+    'Ex.: --prefer "file:prefer.txt" ',
 
-        '\t--prefer=WORDS\t\t'
-        'ROMs containing these words will be preferred'
-        '\n\t\t\t\t'
-        'Ex.: --prefer "Virtual Console,GameCube"'
-        '\n\t\t\t\t'
-        'Ex.: --prefer "file:prefer.txt" ',
+    '\t--avoid=WORDS\t\t'
+    'ROMs containing these words will be avoided (but not excluded).'
+    '\n\t\t\t\t'
+    'Ex.: --avoid "Virtual Console,GameCube"'
+    '\n\t\t\t\t'
+    'Ex.: --avoid "file:avoid.txt" ',
 
-        '\t--avoid=WORDS\t\t'
-        'ROMs containing these words will be avoided (but not excluded).'
-        '\n\t\t\t\t'
-        'Ex.: --avoid "Virtual Console,GameCube"'
-        '\n\t\t\t\t'
-        'Ex.: --avoid "file:avoid.txt" ',
+    '\t--exclude=WORDS\t\t'
+    'ROMs containing these words will be excluded.'
+    '\n\t\t\t\t'
+    'Ex.: --exclude "Virtual Console,GameCube"'
+    '\n\t\t\t\t'
+    'Ex.: --exclude "file:exclude.txt"',
 
-        '\t--exclude=WORDS\t\t'
-        'ROMs containing these words will be excluded.'
-        '\n\t\t\t\t'
-        'Ex.: --exclude "Virtual Console,GameCube"'
-        '\n\t\t\t\t'
-        'Ex.: --exclude "file:exclude.txt"',
+    '\t--exclude-after=WORDS\t'
+    'If the best candidate contains these words, skip all candidates.'
+    '\n\t\t\t\t'
+    'Ex.: --exclude-after "Virtual Console,GameCube"'
+    '\n\t\t\t\t'
+    'Ex.: --exclude-after "file:exclude-after.txt"',
 
-        '\t--exclude-after=WORDS\t'
-        'If the best candidate contains these words, skip all candidates.'
-        '\n\t\t\t\t'
-        'Ex.: --exclude-after "Virtual Console,GameCube"'
-        '\n\t\t\t\t'
-        'Ex.: --exclude-after "file:exclude-after.txt"',
+    '\t--ignore-case\t\t'
+    'If set, the avoid and exclude lists will be case-insensitive',
 
-        '\t--ignore-case\t\t'
-        'If set, the avoid and exclude lists will be case-insensitive',
+    '\t--regex\t\t\t'
+    'If set, the avoid and exclude lists are used as regular expressions',
 
-        '\t--regex\t\t\t'
-        'If set, the avoid and exclude lists are used as regular expressions',
+    '\t--separator=SEP\t\t'
+    'Provides a separator for the avoid, exclude & exclude-after options.'
+    '\n\t\t\t\t'
+    'Default: ","',
 
-        '\t--separator=SEP\t\t'
-        'Provides a separator for the avoid, exclude & exclude-after options.'
-        '\n\t\t\t\t'
-        'Default: ","',
+    '\n# Help and debugging:',
 
-        '\n# Help and debugging:',
+    '\t-h,--help\t\t'
+    'Prints this usage message',
 
-        '\t-h,--help\t\t'
-        'Prints this usage message',
+    '\t-v,--version\t\t'
+    'Prints the version',
 
-        '\t-v,--version\t\t'
-        'Prints the version',
+    '\t-V,--verbose\t\t'
+    'Logs more messages (useful when troubleshooting)',
 
-        '\t-V,--verbose\t\t'
-        'Logs more messages (useful when troubleshooting)',
+    '\t--debug\t\t\t'
+    'Logs even more messages (useful when troubleshooting)',
 
-        '\t--debug\t\t\t'
-        'Logs even more messages (useful when troubleshooting)',
+    '\n# See https://github.com/andrebrait/1g1r-romset-generator/wiki '
+    'for more details')
 
-        '\n# See https://github.com/andrebrait/1g1r-romset-generator/wiki '
-        'for more details'])
+
+@lru_cache(maxsize=None)
+def help_body() -> str:
+    return '\n'.join((
+        'Usage: python3 %s [options] -d input_file.dat' % sys.argv[0],
+        *HELP_LINES))
+
+
+def help_msg(s: Optional[Union[str, Exception]] = None) -> str:
     if s:
-        return '%s\n%s' % (s, help_str)
+        return '%s\n%s' % (s, help_body())
     else:
-        return help_str
+        return help_body()
 
 
 if __name__ == '__main__':
@@ -1,15 +1,29 @@
 import sys
 from json.encoder import JSONEncoder
+from operator import attrgetter
 from pathlib import Path, PurePath
-from threading import Lock, Thread
-from typing import Optional, List, Pattern, TextIO, Tuple, Any
+from threading import Lock, Thread, Event
+from time import monotonic
+from typing import Optional, List, Pattern, TextIO, Tuple, Any, Dict, \
+    Callable, Iterable
 
 from modules.datafile import rom
-from modules.utils import check_in_pattern_list, trim_to, available_columns
+from modules.utils import check_in_pattern_list, trim_to, terminal_columns, \
+    pack_int_lists
 
+# Shared instances of equal values, as the same few values repeat throughout
+# a DAT. The lists must not be mutated once assigned.
+LANGUAGES_CACHE: Dict[Tuple[str, ...], List[str]] = {}
+SCORES_CACHE: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+
+COLUMNS_REFRESH_INTERVAL = 1.0  # seconds
+
+# Every rom has the same attributes, so the public ones are looked up once
+ROM_PUBLIC_KEYS = tuple(k for k in vars(rom()) if not k.endswith('_'))
+get_rom_public_values = attrgetter(*ROM_PUBLIC_KEYS)
 
-class IndexedThread(Thread):
 
+class IndexedThread(Thread):
     def __init__(
             self,
             index: int,
@@ -25,16 +39,69 @@ class IndexedThread(Thread):
 
 
 class FileData:
+    __slots__ = (
+        'size',
+        'path')
+
     def __init__(self, size: int, path: Path):
         self.size = size
         self.path = path
 
-    @staticmethod
-    def get_size(file_data: 'FileData') -> int:
-        return file_data.size
+
+class NameData:
+    __slots__ = (
+        'is_bad',
+        'is_prerelease',
+        'revision',
+        'version',
+        'sample',
+        'demo',
+        'beta',
+        'proto',
+        'region_codes',
+        'languages')
+
+    def __init__(
+            self,
+            is_bad: bool,
+            is_prerelease: bool,
+            revision: str,
+            version: str,
+            sample: str,
+            demo: str,
+            beta: str,
+            proto: str,
+            region_codes: List[str],
+            languages: List[str]):
+        self.is_bad = is_bad
+        self.is_prerelease = is_prerelease
+        self.revision = revision
+        self.version = version
+        self.sample = sample
+        self.demo = demo
+        self.beta = beta
+        self.proto = proto
+        self.region_codes = region_codes
+        self.languages = languages
+
+
+def intern_score(values: Iterable[int]) -> Tuple[int, ...]:
+    values = tuple(values)
+    return SCORES_CACHE.setdefault(values, values)
 
 
 class Score:
+    __slots__ = (
+        'region',
+        'languages',
+        'revision',
+        'version',
+        'sample',
+        'demo',
+        'beta',
+        'proto',
+        'packed')
+
     def __init__(
             self,
             region: int,
@@ -47,15 +114,40 @@ class Score:
             proto: List[int]):
         self.region = region
         self.languages = languages
-        self.revision = revision
-        self.version = version
-        self.sample = sample
-        self.demo = demo
-        self.beta = beta
-        self.proto = proto
+        self.revision = intern_score(revision)
+        self.version = intern_score(version)
+        self.sample = intern_score(sample)
+        self.demo = intern_score(demo)
+        self.beta = intern_score(beta)
+        self.proto = intern_score(proto)
+        self.packed = pack_int_lists(
+            (self.revision,
+             self.version,
+             self.sample,
+             self.demo,
+             self.beta,
+             self.proto))
 
 
 class GameEntry:
+    __slots__ = (
+        'is_bad',
+        'is_prerelease',
+        'region',
+        'languages',
+        'num_languages',
+        'input_index',
+        'revision',
+        'version',
+        'sample',
+        'demo',
+        'beta',
+        'proto',
+        'is_parent',
+        'name',
+        'roms',
+        'score')
+
     def __init__(
             self,
             is_bad: bool,
@@ -74,8 +166,11 @@ class GameEntry:
             roms: List[rom]):
         self.is_bad = is_bad
         self.is_prerelease = is_prerelease
-        self.region = region
-        self.languages = languages
+        self.region = sys.intern(region)
+        self.languages = LANGUAGES_CACHE.setdefault(
+            tuple(languages),
+            languages)
+        self.num_languages = len(languages)
         self.input_index = input_index
         self.revision = revision
         self.version = version
@@ -88,54 +183,6 @@ class GameEntry:
         self.roms = roms
         self.score: Optional[Score] = None
 
-    @staticmethod
-    def get_revision(g: 'GameEntry') -> str:
-        return g.revision
-
-    @staticmethod
-    def get_version(g: 'GameEntry') -> str:
-        return g.version
-
-    @staticmethod
-    def get_sample(g: 'GameEntry') -> str:
-        return g.sample
-
-    @staticmethod
-    def get_demo(g: 'GameEntry') -> str:
-        return g.demo
-
-    @staticmethod
-    def get_beta(g: 'GameEntry') -> str:
-        return g.beta
-
-    @staticmethod
-    def get_proto(g: 'GameEntry') -> str:
-        return g.proto
-
-    @staticmethod
-    def set_revision(g: 'GameEntry', revision: str) -> None:
-        g.revision = revision
-
-    @staticmethod
-    def set_version(g: 'GameEntry', version: str) -> None:
-        g.version = version
-
-    @staticmethod
-    def set_sample(g: 'GameEntry', sample: str) -> None:
-        g.sample = sample
-
-    @staticmethod
-    def set_demo(g: 'GameEntry', demo: str) -> None:
-        g.demo = demo
-
-    @staticmethod
-    def set_beta(g: 'GameEntry', beta: str) -> None:
-        g.beta = beta
-
-    @staticmethod
-    def set_proto(g: 'GameEntry', proto: str) -> None:
-        g.proto = proto
-
 
 class GameEntryKeyGenerator:
     def __init__(
@@ -152,28 +199,63 @@ class GameEntryKeyGenerator:
         self.input_order = input_order
         self.avoid = avoid
         self.prefer = prefer
+        self.key_head: Callable[[GameEntry], Tuple] = \
+            self.__specialize_key_head()
+
+    def __specialize_key_head(self) -> Callable[[GameEntry], Tuple]:
+        # Picks the key builder for this configuration up front, so that
+        # building a key does not branch on it for every entry
+        prefer_prereleases = self.prefer_prereleases
+        prefer_parents = self.prefer_parents
+        avoid = self.avoid
+        prefer = self.prefer
+        index: Callable[[GameEntry], int] = \
+            attrgetter('input_index') if self.input_order else lambda g: 0
+        if self.prioritize_languages:
+            def build_key(g: GameEntry) -> Tuple:
+                return (
+                    g.is_bad,
+                    prefer_prereleases ^ g.is_prerelease,
+                    check_in_pattern_list(g.name, avoid),
+                    g.score.languages,
+                    g.score.region,
+                    prefer_parents and not g.is_parent,
+                    index(g),
+                    not check_in_pattern_list(g.name, prefer))
+        else:
+            def build_key(g: GameEntry) -> Tuple:
+                return (
+                    g.is_bad,
+                    prefer_prereleases ^ g.is_prerelease,
+                    check_in_pattern_list(g.name, avoid),
+                    g.score.region,
+                    g.score.languages,
+                    prefer_parents and not g.is_parent,
+                    index(g),
+                    not check_in_pattern_list(g.name, prefer))
+        return build_key
+
+    # Runs entirely in C, without a Python frame per entry
+    key_score = attrgetter('score.packed')
 
-    def generate(self, g: GameEntry) -> Tuple:
-        return (
-            g.is_bad,
-            self.prefer_prereleases ^ g.is_prerelease,
-            check_in_pattern_list(g.name, self.avoid),
-            g.score.languages if self.prioritize_languages else g.score.region,
-            g.score.region if self.prioritize_languages else g.score.languages,
-            self.prefer_parents and not g.is_parent,
-            g.input_index if self.input_order else 0,
-            not check_in_pattern_list(g.name, self.prefer),
-            g.score.revision,
-            g.score.version,
-            g.score.sample,
-            g.score.demo,
-            g.score.beta,
-            g.score.proto,
-            -len(g.languages),
-            not g.is_parent)
+    @staticmethod
+    def key_tail(g: GameEntry) -> Tuple:
+        return -g.num_languages, not g.is_parent
+
+    def sort(self, games: List[GameEntry]) -> None:
+        # Sorting is stable, so sorting from the least to the most
+        # significant key is the same as sorting by all of them at once
+        games.sort(key=self.key_tail)
+        games.sort(key=self.key_score)
+        games.sort(key=self.key_head)
 
 
 class RegionData:
+    __slots__ = (
+        'code',
+        'pattern',
+        'languages')
+
     def __init__(
             self,
             code: str,
@@ -190,83 +272,141 @@ class MultiThreadedProgressBar:
             count: int,
             num_threads: int,
             prefix: str = '',
-            size: int = 60):
+            size: int = 60,
+            refresh_interval: float = 0.05):
         self.lock = Lock()
+        self.__counter_lock = Lock()
         self.__num_threads = num_threads
         self.__count = count
         self.__prefix = prefix
         self.__size = size
+        self.__refresh_interval = refresh_interval
         self.__curr = 0
         self.__max_num_len = len('%i' % self.__count)
-
-    def __internal_print(self, output_file):
-        for_print = '%s [%s] %*i/%i' % (
-            self.__prefix,
-            '%s%s',
+        self.__template = '%s [%%s%%s] %%%ii/%i\033[K' % (
+            prefix.replace('%', '%%'),
             self.__max_num_len,
-            self.__curr,
-            self.__count)
-        size = max(0, min(self.__size, available_columns(for_print) + 4))
+            count)
+        # Same length as the printed text minus the bar itself
+        self.__text = '%s [%%s%%s] %s/%i' % (
+            prefix,
+            ' ' * self.__max_num_len,
+            count)
+        self.__full_bar = '#' * size
+        self.__empty_bar = '.' * size
+        self.__thread_items: List[Any] = [None] * num_threads
+        self.__painted_items: List[Any] = [None] * num_threads
+        self.__painted_curr = -1
+        self.__finished = Event()
+        self.__renderer: Optional[Thread] = None
+        self.__output_file: TextIO = sys.stderr
+        self.__columns = terminal_columns()
+        self.__columns_checked_at = monotonic()
+
+    def __refresh_columns(self) -> None:
+        now = monotonic()
+        if now - self.__columns_checked_at >= COLUMNS_REFRESH_INTERVAL:
+            self.__columns_checked_at = now
+            columns = terminal_columns()
+            if columns != self.__columns:
+                self.__columns = columns
+                # Everything has to be redrawn to fit the new width
+                self.__painted_items = [None] * self.__num_threads
+                self.__painted_curr = -1
+
+    def __format_bar(self) -> str:
+        size = max(0, min(
+            self.__size,
+            max(0, self.__columns - len(self.__text)) + 4))
         x = int(size * self.__curr / self.__count)
-        print(
-            for_print % (
-                '#' * x,
-                '.' * (size - x)) + '\033[K',
-            end='\r',
-            file=output_file)
+        return self.__template % (
+            self.__full_bar[:x],
+            self.__empty_bar[:size - x],
+            self.__curr) + '\r'
+
+    def __format_thread(self, thread: int, item: Any) -> str:
+        for_print = 'Thread %i: ' % (thread + 1)
+        diff = (self.__num_threads - thread)
+        return (
+            '\r'
+            '\033[%iA'
+            '%s'
+            '%s'
+            '\033[K'
+            '\r'
+            '\033[%iB'
+            '\r' % (
+                diff,
+                for_print,
+                trim_to(item, max(0, self.__columns - len(for_print))),
+                diff))
+
+    def __repaint(self):
+        with self.lock:
+            self.__refresh_columns()
+            buffer = []
+            for thread in range(0, self.__num_threads):
+                item = self.__thread_items[thread]
+                if item is not self.__painted_items[thread]:
+                    buffer.append(self.__format_thread(thread, item))
+                    self.__painted_items[thread] = item
+            if self.__curr != self.__painted_curr:
+                buffer.append(self.__format_bar())
+                self.__painted_curr = self.__curr
+            if buffer:
+                self.__output_file.write(''.join(buffer))
+                self.__output_file.flush()
+
+    def __render(self):
+        while not self.__finished.wait(self.__refresh_interval):
+            self.__repaint()
+        self.__repaint()
 
     def init(self, output_file: TextIO = sys.stderr):
+        self.__output_file = output_file
         with self.lock:
             for i in range(0, self.__num_threads):
                 print(
                     'Thread %i: INITIALIZED\033[K' % (i + 1),
                     file=output_file)
-                self.__internal_print(output_file)
+                print(self.__format_bar(), end='', file=output_file)
+        self.__renderer = Thread(target=self.__render, daemon=True)
+        self.__renderer.start()
 
-    def print_bar(
-            self,
-            increase: int = 1,
-            output_file: TextIO = sys.stderr) -> None:
-        with self.lock:
+    def finish(self) -> None:
+        self.__finished.set()
+        if self.__renderer:
+            self.__renderer.join()
+
+    def print_bar(self, increase: int = 1) -> None:
+        with self.__counter_lock:
             self.__curr += increase
-            self.__internal_print(output_file)
 
-    def print_thread(
-            self,
-            thread: int,
-            item: Any,
-            output_file: TextIO = sys.stderr) -> None:
-        with self.lock:
-            for_print = 'Thread %i: ' % (thread + 1)
-            diff = (self.__num_threads - thread)
-            print(
-                '\r'
-                '\033[%iA'
-                '%s'
-                '%s'
-                '\033[K'
-                '\r'
-                '\033[%iB' % (
-                    diff,
-                    for_print,
-                    trim_to(item, available_columns(for_print)),
-                    diff),
-                end='\r',
-                file=output_file)
+    def print_thread(self, thread: int, item: Any) -> None:
+        self.__thread_items[thread] = item
+
+
+def json_default(o: Any) -> Any:
+    if isinstance(o, rom):
+        return dict(zip(ROM_PUBLIC_KEYS, get_rom_public_values(o)))
+    if isinstance(o, GameEntry):
+        return {
+            ji: getattr(o, ji)
+            for ji in GameEntry.__slots__
+            if ji != 'num_languages'
+        }
+    if isinstance(o, Score):
+        return {
+            ji: getattr(o, ji)
+            for ji in Score.__slots__ if ji != 'packed'
+        }
+    if isinstance(o, PurePath):
+        return str(o)
+    raise TypeError(
+        'Object of type %s is not JSON serializable' % type(o).__name__)
 
 
 class CustomJsonEncoder(JSONEncoder):
 
     def default(self, o: Any) -> Any:
-        if isinstance(o, rom):
-            return {
-                ji: jj
-                for ji, jj in o.__dict__.items() if not ji.endswith('_')
-            }
-        if isinstance(o, GameEntry):
-            return o.__dict__
-        if isinstance(o, Score):
-            return o.__dict__
-        if isinstance(o, PurePath):
-            return str(o)
-        return super().default(o)
+        return json_default(o)
@@ -1,9 +1,9 @@
 import os
 import re
 from abc import ABC, abstractmethod
-from math import log
+from operator import and_, or_, xor
 from pathlib import Path
-from typing import Callable, Iterable, List
+from typing import Callable, Iterable, List, Tuple
 
 try:
     from lxml import etree as etree_
@@ -23,12 +23,27 @@ def _parse_bool(s: str) -> bool:
 
 
 class Rule:
+    __slots__ = (
+        '__start_offset',
+        '__end_offset',
+        '__operation',
+        '__data_tests',
+        '__other_tests')
+
     class Test(ABC):
+        __slots__ = ()
+
         @abstractmethod
         def apply(self, byte_arr: bytes) -> bool:
             pass
 
     class DataTest(Test):
+        __slots__ = (
+            '__offset',
+            '__value',
+            '__end',
+            '__result')
+
         def __init__(
                 self,
                 value: str,
@@ -44,16 +59,29 @@ class Rule:
                     'The length of the value must be divisible by 2: %s'
                     % value)
             self.__offset = int(offset, 16)
-            self.__value = int(value, 16)
-            self.__end = self.__offset + int(value_length / 2)
+            self.__value = bytes.fromhex(value)
+            self.__end = self.__offset + len(self.__value)
             self.__result = bool(_parse_bool(result))
 
         def apply(self, byte_arr: bytes) -> bool:
+            # The data being tested is not there at all
+            if len(byte_arr) < self.__end:
+                return not self.__result
             bytes_slice = byte_arr[self.__offset:self.__end]
-            found_value = int.from_bytes(bytes_slice, 'big')
-            return (found_value == self.__value) == self.__result
+            return (bytes_slice == self.__value) == self.__result
+
+        def unpack(self) -> Tuple[int, int, bytes, bool]:
+            return self.__offset, self.__end, self.__value, self.__result
 
     class BooleanTest(Test):
+        __slots__ = (
+            '__mask',
+            '__value',
+            '__offset',
+            '__end',
+            '__result',
+            '__operation')
+
         def __init__(
                 self,
                 operation: str,
@@ -79,30 +107,30 @@ class Rule:
             self.__operation = self.__get_op(operation)
 
         def apply(self, byte_arr: bytes) -> bool:
-            return (self.__operation(byte_arr) == self.__value) == self.__result
+            if len(byte_arr) < self.__end:
+                return not self.__result
+            found_value = int.from_bytes(
+                byte_arr[self.__offset:self.__end],
+                'big')
+            return (self.__operation(self.__mask, found_value)
+                    == self.__value) == self.__result
 
-        def __get_op(self, name: str) -> Callable[[bytes], int]:
+        @staticmethod
+        def __get_op(name: str) -> Callable[[int, int], int]:
             if name == 'and':
-                return self.__bitwise_and
+                return and_
             if name == 'or':
-                return self.__bitwise_or
+                return or_
             if name == 'xor':
-                return self.__bitwise_xor
+                return xor
             raise ValueError('Unknown boolean test: %s' % name)
 
-        def __bitwise_and(self, byte_arr: bytes) -> int:
-            bytes_slice = byte_arr[self.__offset:self.__end]
-            return self.__mask & int.from_bytes(bytes_slice, 'big')
-
-        def __bitwise_or(self, byte_arr: bytes) -> int:
-            bytes_slice = byte_arr[self.__offset:self.__end]
-            return self.__mask | int.from_bytes(bytes_slice, 'big')
-
-        def __bitwise_xor(self, byte_arr: bytes) -> int:
-            bytes_slice = byte_arr[self.__offset:self.__end]
-            return self.__mask ^ int.from_bytes(bytes_slice, 'big')
-
     class FileTest(Test):
+        __slots__ = (
+            '__operation',
+            '__size',
+            '__result')
+
         def __init__(
                 self,
                 size: str,
@@ -141,7 +169,8 @@ class Rule:
 
         @staticmethod
         def __check_po2(byte_arr: bytes) -> bool:
-            return log(len(byte_arr), 2).is_integer()
+            size = len(byte_arr)
+            return size > 0 and size & (size - 1) == 0
 
     def __init__(
             self,
@@ -160,10 +189,20 @@ class Rule:
         self.__start_offset = int(start_offset, 16)
         self.__end_offset = int(end_offset, 16) if end_offset != 'EOF' else 0
         self.__operation = self.__get_op(operation)
-        self.__tests = tests
+        # Data tests make up most of the tests in detector files, so they are
+        # checked inline instead of through a method call each
+        self.__data_tests = tuple([
+            test.unpack() for test in tests
+            if isinstance(test, Rule.DataTest)])
+        self.__other_tests = tuple([
+            test for test in tests
+            if not isinstance(test, Rule.DataTest)])
 
     def test(self, byte_arr: bytes) -> bool:
-        for test in self.__tests:
+        for offset, end, value, result in self.__data_tests:
+            if (byte_arr[offset:end] == value) != result:
+                return False
+        for test in self.__other_tests:
             if not test.apply(byte_arr):
                 return False
         return True
@@ -207,49 +246,57 @@ class Rule:
 
     @staticmethod
     def __invert_bytes(byte_arr: bytes, chunk_size: int) -> bytes:
-        result = []
-        for i in range(0, len(byte_arr), chunk_size):
-            result.extend(byte_arr[i:i + chunk_size][::-1])
+        result = bytearray(byte_arr)
+        length = len(byte_arr)
+        end = length - length % chunk_size
+        # One strided copy per position within a chunk, instead of one
+        # slice per chunk
+        for i in range(0, chunk_size):
+            result[i:end:chunk_size] = \
+                byte_arr[chunk_size - 1 - i:end:chunk_size]
+        if end < length:
+            result[end:] = byte_arr[end:][::-1]
         return bytes(result)
 
 
 def parse_rules(file: Path) -> List[Rule]:
     file = file.expanduser()
-    try:
-        parser = etree_.ETCompatXMLParser()
-    except AttributeError:
-        parser = etree_.XMLParser()
     try:
         if isinstance(file, os.PathLike):
             file = os.path.join(file)
     except AttributeError:
         pass
-    root = etree_.parse(file, parser).getroot()
     rules: List[Rule] = []
-    for detector in root.iter('detector'):
-        for rule in detector.iter('rule'):
-            tests: List[Rule.Test] = []
-            for test in rule.iter():
-                if test.tag == 'data':
-                    tests.append(Rule.DataTest(
-                        test.get('value'),
-                        test.get('offset'),
-                        test.get('result')))
-                elif test.tag in ('and', 'or', 'xor'):
-                    tests.append(Rule.BooleanTest(
-                        test.tag,
-                        test.get('mask'),
-                        test.get('value'),
-                        test.get('offset'),
-                        test.get('result')))
-                elif test.tag == 'file':
-                    tests.append(Rule.FileTest(
-                        test.get('size'),
-                        test.get('rules'),
-                        test.get('operator')))
-            rules.append(Rule(
-                rule.get('start_offset'),
-                rule.get('end_offset'),
-                rule.get('operation'),
-                tests))
+    # Streams the file instead of building the whole tree first
+    for _, rule in etree_.iterparse(file, events=('end',)):
+        if rule.tag != 'rule':
+            continue
+        tests: List[Rule.Test] = []
+        # Tests are direct children of their rule
+        for test in rule:
+            get = test.attrib.get
+            if test.tag == 'data':
+                tests.append(Rule.DataTest(
+                    get('value'),
+                    get('offset'),
+                    get('result')))
+            elif test.tag in ('and', 'or', 'xor'):
+                tests.append(Rule.BooleanTest(
+                    test.tag,
+                    get('mask'),
+                    get('value'),
+                    get('offset'),
+                    get('result')))
+            elif test.tag == 'file':
+                tests.append(Rule.FileTest(
+                    get('size'),
+                    get('rules'),
+                    get('operator')))
+        get = rule.attrib.get
+        rules.append(Rule(
+            get('start_offset'),
+            get('end_offset'),
+            get('operation'),
+            tests))
+        rule.clear()
     return rules
@@ -1,8 +1,16 @@
+import re
 import shutil
-from typing import List, Any, Pattern, Optional, Match, Iterable
+import struct
+from itertools import zip_longest
+from typing import List, Any, Pattern, Optional, Match, Iterable, \
+    Sequence
 
 TRIM_PREFIX = '(...)'
 
+# Keeps every packed value above zero, so that the terminator of a shorter
+# list always sorts before any element of a longer one
+PACKING_BIAS = 0x110001
+
 
 def get_index(ls: List[Any], item: Any, default: int) -> int:
     try:
@@ -21,24 +29,43 @@ def check_in_pattern_list(name: str, patterns: Iterable[Pattern]) -> bool:
     return False
 
 
+def merge_patterns(patterns: List[Pattern]) -> List[Pattern]:
+    if len(patterns) < 2:
+        return patterns
+    flags = patterns[0].flags
+    # Capturing groups would be renumbered, breaking backreferences
+    if any(p.groups or p.flags != flags for p in patterns):
+        return patterns
+    try:
+        return [re.compile(
+            '|'.join(['(?:%s)' % p.pattern for p in patterns]),
+            flags)]
+    except re.error:
+        return patterns
+
+
 def to_int_list(string: str, multiplier: int) -> List[int]:
     return [multiplier * ord(x) for x in string]
 
 
-def get(ls: List[int], index: int) -> int:
-    return ls[index] if index < len(ls) else 0
+def pack_int_lists(int_lists: Iterable[Sequence[int]]) -> bytes:
+    return b''.join([
+        struct.pack(
+            '>%iI' % (len(int_list) + 1),
+            *[i + PACKING_BIAS for i in int_list],
+            0)
+        for int_list in int_lists])
 
 
 def add_padding(strings: List[str]) -> List[str]:
     parts_list = [s.split('.') for s in strings]
     lengths = [[len(part) for part in parts] for parts in parts_list]
-    max_parts = max([len(parts) for parts in parts_list])
-    max_lengths = [max([get(lenght, i) for lenght in lengths])
-                   for i in range(0, max_parts)]
-    for parts in parts_list:
-        for i in range(0, len(parts)):
-            parts[i] = ('0' * (max_lengths[i] - len(parts[i]))) + parts[i]
-    return ['.'.join(parts) for parts in parts_list]
+    max_lengths = [max(column)
+                   for column in zip_longest(*lengths, fillvalue=0)]
+    return [
+        '.'.join([part.rjust(max_length, '0')
+                  for part, max_length in zip(parts, max_lengths)])
+        for parts in parts_list]
 
 
 def get_or_default(match: Optional[Match], default: str) -> str:
@@ -46,9 +73,12 @@ def get_or_default(match: Optional[Match], default: str) -> str:
     return version if version else default
 
 
+def terminal_columns() -> int:
+    return shutil.get_terminal_size((80, 20)).columns
+
+
 def available_columns(current_text: str) -> int:
-    term_size = shutil.get_terminal_size((80, 20))
-    return max(0, term_size.columns - len(current_text))
+    return max(0, terminal_columns() - len(current_text))
 
 
 def trim_to(obj: Any, n: int) -> str:
@@ -56,7 +86,3 @@ def trim_to(obj: Any, n: int) -> str:
     if len(text) > n:
         return '%s%s' % (TRIM_PREFIX, text[-(n - len(TRIM_PREFIX)):])
     return text
-
-
-def is_valid(x: str) -> bool:
-    return bool(x and not x.isspace())